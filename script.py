@@ -5,7 +5,6 @@ import pandas as pd
 import json
 from datetime import datetime
 import io
-import base64
 from sft_number_generator import SFTNumberGenerator
 
 # Page configuration
@@ -52,17 +51,6 @@ st.markdown("""
 if 'generator' not in st.session_state:
     st.session_state.generator = SFTNumberGenerator()
 
-def get_download_link(df, filename):
-    """Generate download link for Excel file"""
-    output = io.BytesIO()
-    with pd.ExcelWriter(output, engine='openpyxl') as writer:
-        df.to_excel(writer, index=False)
-    
-    excel_data = output.getvalue()
-    b64 = base64.b64encode(excel_data).decode()
-    href = f'<a href="data:application/vnd.openxmlformats-officedocument.spreadsheetml.sheet;base64,{b64}" download="{filename}">📥 Download Excel File</a>'
-    return href
-
 def main():
     # Header
     st.markdown('<h1 class="main-header">🔢 SFT Number Generator System</h1>', unsafe_allow_html=True)
@@ -1,12 +1,40 @@
 import streamlit as st
-import pandas as pd
-import json
 from datetime import datetime
-import io
 import base64
 import random
 import os
 import re
+import threading
+from functools import lru_cache
+
+# orjson is much faster; fall back to the standard library if it is missing
+try:
+    import orjson
+
+    def json_dumps(obj):
+        return orjson.dumps(obj)
+
+    json_loads = orjson.loads
+except ImportError:
+    import json
+
+    def json_dumps(obj):
+        return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+    json_loads = json.loads
+
+# One bulk registration line: "AppName | Description", description optional,
+# with surrounding whitespace trimmed from both fields
+BULK_LINE_PATTERN = re.compile(r'^[^\S\n]*([^|\s][^|\n]*?)[^\S\n]*(?:\|[^\S\n]*(.*?)[^\S\n]*)?$', re.M)
+
+# Characters dropped from an upper-cased application name before taking its prefix
+APP_PREFIX_CLEAN_PATTERN = re.compile(r'[^A-Z0-9]')
+
+# Data versions kept by the caches keyed on the stored data; older results are evicted
+CACHE_MAX_VERSIONS = 4
+
+# Rows shown in the Export page preview
+EXPORT_PREVIEW_ROWS = 100
 
 # Page configuration
 st.set_page_config(
@@ -16,35 +44,25 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Custom CSS
-st.markdown("""
-<style>
-    .main-header {
-        font-size: 2.5rem;
-        color: #1f77b4;
-        text-align: center;
-        margin-bottom: 2rem;
-    }
-    .sft-number {
-        font-size: 1.8rem;
-        font-weight: bold;
-        color: #2E8B57;
-        text-align: center;
-        padding: 1rem;
-        background-color: #f0f8f0;
-        border: 2px solid #2E8B57;
-        border-radius: 0.5rem;
-        margin: 1rem 0;
-    }
-    .success-message {
-        padding: 0.5rem;
-        background-color: #d4edda;
-        border: 1px solid #c3e6cb;
-        border-radius: 0.25rem;
-        color: #155724;
-    }
-</style>
-""", unsafe_allow_html=True)
+@st.cache_resource
+def load_css():
+    """Read the stylesheet once per process"""
+    with open(os.path.join(os.path.dirname(__file__), 'static', 'styles.css')) as f:
+        return f"<style>\n{f.read()}</style>"
+
+# Custom CSS (emitted on every rerun, since elements not re-sent are dropped)
+st.markdown(load_css(), unsafe_allow_html=True)
+
+@st.cache_data(show_spinner=False, max_entries=CACHE_MAX_VERSIONS)
+def registration_timeline(_df, data_version):
+    """Daily registration counts for the timeline chart; cached until the data changes"""
+    import pandas as pd
+
+    # Timestamps are written as "%Y-%m-%d %H:%M:%S", so the first 10 characters
+    # are the day; only the distinct days need parsing
+    daily_counts = _df['Registration_Date'].str[:10].value_counts().sort_index()
+    daily_counts.index = pd.to_datetime(daily_counts.index, format="%Y-%m-%d")
+    return daily_counts.rename_axis('Date').to_frame('Applications')
 
 class ImprovedSFTNumberGenerator:
     """
@@ -55,14 +73,35 @@ class ImprovedSFTNumberGenerator:
         self.min_number = 3000
         self.max_number = 9999
         self.data_file = 'sft_persistent_data.json'
+        # Records registered since the data file was last written, one JSON object per line
+        self.log_file = 'sft_persistent_data.log.jsonl'
+        # Fold the log into the data file once it holds this many records
+        self.log_compact_records = 500
+
+        # Bumped on every data change so derived results can be reused until then;
+        # the token keeps versions of different instances apart in shared caches
+        self._version = 0
+        self._version_token = os.urandom(8).hex()
+        self._stats_cache = None
+        self._df_cache = None
+        self._search_cache = None
+
+        # Draw from the generator's own random state rather than the module-level one
+        self._rng = random.Random()
+
+        # The generator is shared by all sessions; registrations and reads of
+        # derived state hold this lock
+        self._lock = threading.RLock()
 
         # Load persistent data
         self.load_persistent_data()
 
-    def extract_app_prefix(self, app_name):
-        """Extract 4-character prefix from application name"""
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def extract_app_prefix(app_name):
+        """Extract 4-character prefix from application name (cached per name)"""
         # Clean the application name
-        cleaned = re.sub(r'[^a-zA-Z0-9]', '', app_name.upper())
+        cleaned = APP_PREFIX_CLEAN_PATTERN.sub('', app_name.upper())
 
         if len(cleaned) == 0:
             return "XXXX"
@@ -80,176 +119,755 @@ class ImprovedSFTNumberGenerator:
 
     def load_persistent_data(self):
         """Load data from persistent storage"""
+        created = None
         try:
             if os.path.exists(self.data_file):
-                with open(self.data_file, 'r') as f:
-                    data = json.load(f)
-                    st.session_state.used_numbers = set(data.get('used_numbers', []))
-                    st.session_state.applications = data.get('applications', [])
-                    st.session_state.sft_mapping = data.get('sft_mapping', {})
-                print(f"✅ Loaded {len(st.session_state.applications)} applications from persistent storage")
+                with open(self.data_file, 'rb') as f:
+                    data = json_loads(f.read())
+                self.used_bitmap = self._bitmap_from_data(data)
+                self.applications = self._applications_from_data(data)
+                # Only the older row-per-record format stored the mapping
+                self.sft_mapping = data.get('sft_mapping') or {
+                    app['SFT_Number']: self._mapping_entry(app) for app in self.applications
+                }
+                created = False
             else:
                 # Initialize empty data structures
-                st.session_state.used_numbers = set()
-                st.session_state.applications = []
-                st.session_state.sft_mapping = {}
-                print("📁 Created new persistent storage")
+                self.used_bitmap = self._empty_bitmap()
+                self.applications = []
+                self.sft_mapping = {}
+                created = True
         except Exception as e:
             print(f"❌ Error loading persistent data: {e}")
-            st.session_state.used_numbers = set()
-            st.session_state.applications = []
-            st.session_state.sft_mapping = {}
+            self.used_bitmap = self._empty_bitmap()
+            self.applications = []
+            self.sft_mapping = {}
+
+        # Lower-cased names of registered applications, for O(1) duplicate checks
+        self.registered_names = {app['Application_Name'].lower() for app in self.applications}
+
+        # Fold logged records into a fresh data file once the log has grown;
+        # a short log is cheaper to replay than the data file is to rewrite
+        self._log_replay_failed = False
+        self._log_records = self._replay_log()
+        self._compact_log_if_large()
+
+        # Reported after the replay, which can add records with or without a data file
+        if created and not self.applications:
+            print("📁 Created new persistent storage")
+        elif created is not None:
+            print(f"✅ Loaded {len(self.applications)} applications from persistent storage")
+
+        # Numbers still available for allocation, kept unordered for O(1) removal
+        self.free_numbers = [
+            n for n in range(self.min_number, self.max_number + 1)
+            if not self._is_used(n)
+        ]
+        # Position of each free number in free_numbers, so reservations are O(1) too
+        self.free_index = {n: i for i, n in enumerate(self.free_numbers)}
+        self._reset_usage_totals()
+
+    def _replay_log(self):
+        """Apply records appended to the log file; returns how many were replayed"""
+        if not os.path.exists(self.log_file):
+            return 0
+
+        replayed = 0
+        try:
+            with open(self.log_file, 'rb') as f:
+                lines = f.readlines()
+
+            kept = []
+            rejected = []
+            for line in lines:
+                if not line.endswith(b'\n'):
+                    # A crash mid-append can leave a partial last line
+                    continue
+                try:
+                    record = json_loads(line)
+                    number = self._logged_number(record)
+                except ValueError:
+                    rejected.append(line)
+                    continue
+                kept.append(line)
+                # A crash between writing the data file and removing the log
+                # leaves records that are already loaded
+                if record['SFT_Number'] in self.sft_mapping:
+                    continue
+                self._set_used_bit(number)
+                self._add_record(record)
+                replayed += 1
+
+            if rejected:
+                # Keep unusable lines for inspection instead of losing them at compaction
+                with open(self.log_file + '.rejected', 'ab') as f:
+                    f.write(b''.join(rejected))
+                print(f"⚠️ Moved {len(rejected)} unusable log records to {self.log_file}.rejected")
+            if len(kept) < len(lines):
+                # Rewrite the log without the torn tail or rejected lines, so the
+                # next append starts on a fresh line
+                tmp_file = self.log_file + '.tmp'
+                with open(tmp_file, 'wb') as f:
+                    f.write(b''.join(kept))
+                os.replace(tmp_file, self.log_file)
+            return replayed
+        except Exception as e:
+            # Memory may now lack records the log still holds, so the log
+            # must not be folded into the data file
+            self._log_replay_failed = True
+            print(f"❌ Error replaying persistent log: {e}")
+            return replayed
+
+    def _logged_number(self, record):
+        """Check that a logged record can be applied and return its number; raises ValueError if not"""
+        if not isinstance(record, dict) or not all(
+            isinstance(record.get(field), str)
+            for field in ('SFT_Number', 'Application_Name', 'Registration_Date')
+        ):
+            raise ValueError("log record is missing required fields")
+
+        number = int(record['SFT_Number'][-4:])
+        if not (self.min_number <= number <= self.max_number):
+            raise ValueError(f"log record number {number} is outside the valid range")
+        if self._is_used(number) and record['SFT_Number'] not in self.sft_mapping:
+            raise ValueError(f"log record number {number} is already in use")
+        return number
+
+    def _append_to_log(self, records):
+        """Persist new records by appending them to the log file"""
+        try:
+            with open(self.log_file, 'ab') as f:
+                f.write(b''.join(json_dumps(record) + b'\n' for record in records))
+            print("💾 Data saved to persistent storage")
+        except Exception as e:
+            print(f"❌ Error saving persistent data: {e}")
+            return
+
+        self._log_records += len(records)
+        self._compact_log_if_large()
+
+    def _compact_log_if_large(self):
+        """Fold the log into the data file once it holds log_compact_records records"""
+        # After a failed replay the log holds records that memory lacks
+        if self._log_replay_failed:
+            return
+        # Every session shares this generator, so its data is complete and
+        # can replace the data file
+        if self._log_records >= self.log_compact_records:
+            self.save_persistent_data()
+
+    def _empty_bitmap(self):
+        """Bitmap with one clear bit per number in the range"""
+        return bytearray((self.max_number - self.min_number) // 8 + 1)
+
+    def _bitmap_from_data(self, data):
+        """Decode the stored used-number bitmap, accepting the older list format"""
+        if 'used_bitmap' in data:
+            return bytearray(base64.b64decode(data['used_bitmap']))
+
+        bitmap = self._empty_bitmap()
+        for number in data.get('used_numbers', []):
+            offset = number - self.min_number
+            bitmap[offset >> 3] |= 1 << (offset & 7)
+        return bitmap
+
+    def _applications_from_data(self, data):
+        """Rebuild application records from the stored columns, accepting the older row-per-record format"""
+        if 'application_columns' not in data:
+            return data.get('applications', [])
+
+        columns = data['application_columns']
+        fields = list(columns)
+        # Fields a record did not have are stored as null
+        return [
+            {field: value for field, value in zip(fields, row) if value is not None}
+            for row in zip(*columns.values())
+        ]
+
+    def _application_columns(self):
+        """Transpose the application records into one list per field for the data file"""
+        fields = dict.fromkeys(field for app in self.applications for field in app)
+        return {field: [app.get(field) for app in self.applications] for field in fields}
+
+    def _is_used(self, number):
+        """Check the bitmap bit for a number inside the range"""
+        offset = number - self.min_number
+        return bool(self.used_bitmap[offset >> 3] & (1 << (offset & 7)))
+
+    def _reset_usage_totals(self):
+        """Recompute the running lowest/highest/sum of used numbers"""
+        used_numbers = [n for n in range(self.min_number, self.max_number + 1) if self._is_used(n)]
+        self._used_min = min(used_numbers) if used_numbers else None
+        self._used_max = max(used_numbers) if used_numbers else None
+        self._used_sum = sum(used_numbers)
+
+    def _set_used_bit(self, number):
+        """Set the bitmap bit for a number inside the range"""
+        offset = number - self.min_number
+        self.used_bitmap[offset >> 3] |= 1 << (offset & 7)
+
+    def _mark_number_used(self, number):
+        """Mark a number as used and fold it into the running totals"""
+        self._set_used_bit(number)
+        self._used_sum += number
+        self._used_min = number if self._used_min is None else min(self._used_min, number)
+        self._used_max = number if self._used_max is None else max(self._used_max, number)
 
     def save_persistent_data(self):
         """Save data to persistent storage"""
         try:
             data = {
-                'used_numbers': list(st.session_state.used_numbers),
-                'applications': st.session_state.applications,
-                'sft_mapping': st.session_state.sft_mapping,
+                'used_bitmap': base64.b64encode(self.used_bitmap).decode('ascii'),
+                # One list per field; field names are not repeated per record
+                'application_columns': self._application_columns(),
                 'last_updated': datetime.now().isoformat()
             }
-            with open(self.data_file, 'w') as f:
-                json.dump(data, f, indent=2)
+            # Write to a temporary file and swap it in so a crash mid-write
+            # never leaves a truncated data file behind
+            tmp_file = self.data_file + '.tmp'
+            with open(tmp_file, 'wb') as f:
+                f.write(json_dumps(data))
+            os.replace(tmp_file, self.data_file)
+            # Everything logged so far is now part of the data file
+            if os.path.exists(self.log_file):
+                os.remove(self.log_file)
+            self._log_records = 0
             print("💾 Data saved to persistent storage")
         except Exception as e:
             print(f"❌ Error saving persistent data: {e}")
 
     def generate_sft_number(self, app_name):
         """Generate formatted SFT number: SFT_XXYZ3000-9999"""
-        # Get application prefix
-        app_prefix = self.extract_app_prefix(app_name)
+        with self._lock:
+            # Get application prefix
+            app_prefix = self.extract_app_prefix(app_name)
 
-        # Find available number
-        available_numbers = self.max_number - self.min_number + 1
-        if len(st.session_state.used_numbers) >= available_numbers:
-            raise ValueError("All SFT numbers in the range have been exhausted!")
+            # Find available number
+            free_numbers = self.free_numbers
+            if not free_numbers:
+                raise ValueError("All SFT numbers in the range have been exhausted!")
 
-        # Generate unique number
-        while True:
-            number = random.randint(self.min_number, self.max_number)
-            if number not in st.session_state.used_numbers:
-                st.session_state.used_numbers.add(number)
+            # Draw a random free number
+            number = self._take_free_number(self._rng.randrange(len(free_numbers)))
+            self._mark_number_used(number)
 
-                # Create formatted SFT number
-                sft_number = f"SFT_{app_prefix}{number}"
-                return sft_number
+            # Create formatted SFT number
+            sft_number = f"SFT_{app_prefix}{number}"
+            return sft_number
 
-    def register_application(self, app_name, description=""):
-        """Register a new application and assign an SFT number"""
-        try:
+    def _take_free_number(self, index):
+        """Remove and return the free number at index, filling its slot with the last entry"""
+        free_numbers = self.free_numbers
+        free_index = self.free_index
+
+        number = free_numbers[index]
+        last = free_numbers.pop()
+        if last != number:
+            free_numbers[index] = last
+            free_index[last] = index
+        del free_index[number]
+        return number
+
+    def _draw_free_numbers(self, count):
+        """Draw up to count distinct random free numbers in one batch"""
+        free_numbers = self.free_numbers
+        positions = self._rng.sample(range(len(free_numbers)), min(count, len(free_numbers)))
+        numbers = [free_numbers[i] for i in positions]
+
+        # Remove from the highest position down so the remaining positions stay valid
+        for index in sorted(positions, reverse=True):
+            self._take_free_number(index)
+        for number in numbers:
+            self._mark_number_used(number)
+
+        return numbers
+
+    @staticmethod
+    def _now_str():
+        """Current time as "YYYY-MM-DD HH:MM:SS", the stored Registration_Date format"""
+        return datetime.now().isoformat(sep=' ', timespec='seconds')
+
+    def _register_in_memory(self, app_name, description="", number=None, timestamp=None):
+        """Assign an SFT number (or use an already drawn one) and record the application without saving
+
+        Callers check the name is not already registered.
+        """
+        app_prefix = self.extract_app_prefix(app_name)
+        if number is None:
             sft_number = self.generate_sft_number(app_name)
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        else:
+            sft_number = f"SFT_{app_prefix}{number}"
+        if timestamp is None:
+            timestamp = self._now_str()
 
-            new_record = {
-                'SFT_Number': sft_number,
-                'Application_Name': app_name,
-                'Description': description,
-                'Registration_Date': timestamp,
-                'Status': 'Active',
-                'App_Prefix': self.extract_app_prefix(app_name)
-            }
+        new_record = {
+            'SFT_Number': sft_number,
+            'Application_Name': app_name,
+            'Description': description,
+            'Registration_Date': timestamp,
+            'Status': 'Active',
+            'App_Prefix': app_prefix
+        }
+        self._add_record(new_record)
 
-            st.session_state.applications.append(new_record)
+        return sft_number
 
-            # Update mapping for quick lookup
-            st.session_state.sft_mapping[sft_number] = {
-                'app_name': app_name,
-                'registration_date': timestamp
-            }
+    def _check_new_name(self, app_name):
+        """Reject an application name that is already registered (case-insensitive)"""
+        if app_name.lower() in self.registered_names:
+            raise ValueError(f"Application '{app_name}' is already registered")
 
-            # Save to persistent storage
-            self.save_persistent_data()
+    def _add_record(self, record):
+        """Add an application record and its lookup entry to the in-memory data"""
+        self.applications.append(record)
+        self.registered_names.add(record['Application_Name'].lower())
+        self._version += 1
 
-            return sft_number
+        # Update mapping for quick lookup
+        self.sft_mapping[record['SFT_Number']] = self._mapping_entry(record)
 
-        except Exception as e:
-            st.error(f"Error registering application: {e}")
-            return None
+    @staticmethod
+    def _mapping_entry(record):
+        """sft_mapping value for an application record"""
+        return {
+            'app_name': record['Application_Name'],
+            'registration_date': record['Registration_Date']
+        }
+
+    def register_application(self, app_name, description=""):
+        """Register a new application and assign an SFT number"""
+        with self._lock:
+            # A duplicate name will never succeed, so let the caller report it
+            self._check_new_name(app_name)
+
+            try:
+                sft_number = self._register_in_memory(app_name, description)
+
+                # Save to persistent storage
+                self._append_to_log(self.applications[-1:])
+
+                return sft_number
+
+            except Exception as e:
+                st.error(f"Error registering application: {e}")
+                return None
 
     def bulk_register_applications(self, applications_list):
-        """Register multiple applications at once"""
-        results = []
-        for app in applications_list:
-            sft_number = self.register_application(
-                app.get('name', 'Unknown'),
-                app.get('description', '')
-            )
-            results.append({
-                'application': app.get('name', 'Unknown'),
-                'sft_number': sft_number,
-                'success': sft_number is not None
-            })
-        return results
+        """Register multiple applications at once, saving once at the end"""
+        with self._lock:
+            results = []
+            first_new = len(self.applications)
+
+            # Find names that are already registered or repeat earlier in the
+            # batch first, so numbers are only drawn for the rest
+            names = [app.get('name', 'Unknown') for app in applications_list]
+            batch_names = set()
+            rejections = []
+            for name in names:
+                if name.lower() in self.registered_names:
+                    rejections.append(f"Application '{name}' is already registered")
+                elif name.lower() in batch_names:
+                    rejections.append(f"Application '{name}' appears more than once in this batch")
+                else:
+                    rejections.append(None)
+                batch_names.add(name.lower())
+
+            numbers = iter(self._draw_free_numbers(rejections.count(None)))
+            # One registration time for the whole batch
+            timestamp = self._now_str()
+            for app, name, rejection in zip(applications_list, names, rejections):
+                try:
+                    if rejection:
+                        raise ValueError(rejection)
+                    # Past the drawn batch the range is exhausted and
+                    # generate_sft_number reports it
+                    sft_number = self._register_in_memory(
+                        name,
+                        app.get('description', ''),
+                        next(numbers, None),
+                        timestamp
+                    )
+                except Exception as e:
+                    st.error(f"Error registering application: {e}")
+                    sft_number = None
+
+                results.append({
+                    'application': name,
+                    'sft_number': sft_number,
+                    'success': sft_number is not None
+                })
+
+            # Single write for the whole batch
+            if any(r['success'] for r in results):
+                self._append_to_log(self.applications[first_new:])
+
+            return results
 
     def reserve_specific_number(self, number, app_name, description=""):
         """Reserve a specific number in the SFT format"""
-        if not (self.min_number <= number <= self.max_number):
-            raise ValueError(f"Number {number} is outside valid range ({self.min_number}-{self.max_number})")
+        with self._lock:
+            if not (self.min_number <= number <= self.max_number):
+                raise ValueError(f"Number {number} is outside valid range ({self.min_number}-{self.max_number})")
 
-        if number in st.session_state.used_numbers:
-            raise ValueError(f"Number {number} is already in use")
+            if self._is_used(number):
+                raise ValueError(f"Number {number} is already in use")
 
-        # Generate formatted SFT number
-        app_prefix = self.extract_app_prefix(app_name)
-        sft_number = f"SFT_{app_prefix}{number}"
+            self._check_new_name(app_name)
 
-        st.session_state.used_numbers.add(number)
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            # Generate formatted SFT number
+            app_prefix = self.extract_app_prefix(app_name)
+            sft_number = f"SFT_{app_prefix}{number}"
 
-        new_record = {
-            'SFT_Number': sft_number,
-            'Application_Name': app_name,
-            'Description': description,
-            'Registration_Date': timestamp,
-            'Status': 'Reserved',
-            'App_Prefix': app_prefix
-        }
+            self._take_free_number(self.free_index[number])
+            self._mark_number_used(number)
+            timestamp = self._now_str()
 
-        st.session_state.applications.append(new_record)
-        st.session_state.sft_mapping[sft_number] = {
-            'app_name': app_name,
-            'registration_date': timestamp
-        }
+            new_record = {
+                'SFT_Number': sft_number,
+                'Application_Name': app_name,
+                'Description': description,
+                'Registration_Date': timestamp,
+                'Status': 'Reserved',
+                'App_Prefix': app_prefix
+            }
+            self._add_record(new_record)
 
-        # Save to persistent storage
-        self.save_persistent_data()
+            # Save to persistent storage
+            self._append_to_log([new_record])
 
-        return sft_number
+            return sft_number
 
     def get_statistics(self):
         """Get statistics about SFT number usage"""
-        total_available = self.max_number - self.min_number + 1
-        used_count = len(st.session_state.used_numbers)
-        remaining = total_available - used_count
-
-        return {
-            'total_available': total_available,
-            'used_count': used_count,
-            'remaining': remaining,
-            'usage_percentage': (used_count / total_available) * 100
-        }
+        with self._lock:
+            if self._stats_cache is not None and self._stats_cache[0] == self._version:
+                return self._stats_cache[1]
+
+            total_available = self.max_number - self.min_number + 1
+            used_count = int.from_bytes(self.used_bitmap, 'little').bit_count()
+            remaining = total_available - used_count
+
+            stats = {
+                'total_available': total_available,
+                'used_count': used_count,
+                'remaining': remaining,
+                'usage_percentage': (used_count / total_available) * 100,
+                'lowest_used': self._used_min,
+                'highest_used': self._used_max,
+                'average_used': self._used_sum / used_count if used_count else None
+            }
+            self._stats_cache = (self._version, stats)
+            return stats
 
     def is_number_available(self, number):
         """Check if a specific number is available"""
-        return (self.min_number <= number <= self.max_number) and (number not in st.session_state.used_numbers)
+        return (self.min_number <= number <= self.max_number) and not self._is_used(number)
 
     def search_applications(self, search_term):
         """Search applications by name or SFT number"""
-        results = []
         search_term = search_term.upper()
 
-        for app in st.session_state.applications:
-            if (search_term in app['Application_Name'].upper() or 
-                search_term in app['SFT_Number'].upper() or
-                search_term in app.get('Description', '').upper()):
-                results.append(app)
+        with self._lock:
+            if not self.applications:
+                return []
+
+            # Match against all rows at once instead of looping over records
+            columns = self._get_search_columns()
+            mask = (columns['Application_Name'].str.contains(search_term, regex=False)
+                    | columns['SFT_Number'].str.contains(search_term, regex=False)
+                    | columns['Description'].str.contains(search_term, regex=False))
+            return [self.applications[i] for i in mask.to_numpy().nonzero()[0]]
+
+    def _get_search_columns(self):
+        """Upper-cased searchable fields of all applications, rebuilt only when the data changed"""
+        import pandas as pd
+
+        if self._search_cache is None or self._search_cache[0] != self._version:
+            # str.upper here rather than the pandas accessor, which does not
+            # apply full Unicode case mapping (e.g. "ß" -> "SS")
+            columns = pd.DataFrame({
+                'Application_Name': [app['Application_Name'].upper() for app in self.applications],
+                'SFT_Number': [app['SFT_Number'].upper() for app in self.applications],
+                'Description': [app.get('Description', '').upper() for app in self.applications]
+            })
+            self._search_cache = (self._version, columns)
+        return self._search_cache[1]
+
+    def get_applications_df(self):
+        """DataFrame of all applications, rebuilt only when the data changed (do not mutate)"""
+        return self.get_versioned_applications_df()[1]
+
+    def get_versioned_applications_df(self):
+        """(data version, applications DataFrame) read together, for keying caches shared across sessions"""
+        import pandas as pd
+
+        with self._lock:
+            if self._df_cache is None or self._df_cache[0] != self._version:
+                self._df_cache = (self._version, pd.DataFrame(self.applications))
+            return (self._version_token, self._df_cache[0]), self._df_cache[1]
+
+@st.cache_resource
+def get_generator():
+    """One generator, and one copy of the loaded data, shared by every session"""
+    return ImprovedSFTNumberGenerator()
+
+@st.cache_data(show_spinner=False, max_entries=CACHE_MAX_VERSIONS)
+def build_excel_report(_df, stats, data_version):
+    """Build the multi-sheet Excel report as bytes; cached until the stored data changes"""
+    import io
+    import pandas as pd
+    import xlsxwriter
+
+    excel_data = io.BytesIO()
+    # Every sheet is written strictly row by row, so constant_memory can flush
+    # each row as soon as the next one starts
+    workbook = xlsxwriter.Workbook(excel_data, {'constant_memory': True, 'strings_to_urls': False})
+
+    applications_sheet = workbook.add_worksheet('Applications')
+    applications_sheet.write_row(0, 0, list(_df.columns))
+    # Records missing a field come through as NaN, which xlsxwriter rejects;
+    # write those cells blank instead
+    for row_num, row in enumerate(_df.itertuples(index=False, name=None), start=1):
+        applications_sheet.write_row(row_num, 0, [None if pd.isna(v) else v for v in row])
+
+    # Add summary sheet with stats
+    summary_sheet = workbook.add_worksheet('Summary')
+    summary_rows = [
+        ('Metric', 'Value'),
+        ('Total Available', stats['total_available']),
+        ('Used Numbers', stats['used_count']),
+        ('Remaining Numbers', stats['remaining']),
+        ('Usage Percentage', f"{stats['usage_percentage']:.2f}%")
+    ]
+    for row_num, row in enumerate(summary_rows):
+        summary_sheet.write_row(row_num, 0, row)
+
+    # Prefix analysis sheet
+    if len(_df) > 0:
+        prefix_sheet = workbook.add_worksheet('Prefix_Analysis')
+        prefix_sheet.write_row(0, 0, ('Prefix', 'Count'))
+        for row_num, (prefix, count) in enumerate(_df['App_Prefix'].value_counts().items(), start=1):
+            prefix_sheet.write_row(row_num, 0, (prefix, int(count)))
+
+    workbook.close()
+    return excel_data.getvalue()
+
+@st.cache_data(show_spinner=False, max_entries=CACHE_MAX_VERSIONS)
+def build_csv(_df, data_version):
+    """CSV bytes of the applications table via pyarrow; cached until the stored data changes"""
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+
+    csv_data = pa.BufferOutputStream()
+    pacsv.write_csv(pa.Table.from_pandas(_df, preserve_index=False), csv_data)
+    return csv_data.getvalue().to_pybytes()
+
+@st.cache_data(show_spinner=False, max_entries=CACHE_MAX_VERSIONS)
+def build_parquet(_df, data_version):
+    """zstd-compressed Parquet bytes of the applications table; cached until the stored data changes"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    parquet_data = pa.BufferOutputStream()
+    pq.write_table(pa.Table.from_pandas(_df, preserve_index=False), parquet_data, compression='zstd')
+    return parquet_data.getvalue().to_pybytes()
+
+@st.fragment
+def render_search(generator):
+    """Search box and results; typing a term reruns only this fragment"""
+    search_term = st.text_input("Search by Application Name, SFT Number, or Description", 
+                              placeholder="e.g., WebApp or SFT_WEBA or authentication")
+
+    if search_term:
+        results = generator.search_applications(search_term)
+
+        if results:
+            import pandas as pd
+
+            st.success(f"Found {len(results)} matching applications:")
+            df = pd.DataFrame(results)
+            st.dataframe(df, use_container_width=True)
 
-        return results
+            # Show breakdown by prefix
+            if len(results) > 1:
+                prefixes = [app.get('App_Prefix', 'N/A') for app in results]
+                prefix_counts = pd.Series(prefixes).value_counts()
+
+                st.subheader("📊 Applications by Prefix")
+                col1, col2 = st.columns(2)
+                with col1:
+                    st.bar_chart(prefix_counts)
+                with col2:
+                    for prefix, count in prefix_counts.items():
+                        st.metric(f"Prefix: {prefix}", count)
+        else:
+            st.info("No applications found matching your search term.")
 
-# Initialize improved generator
-if 'improved_generator' not in st.session_state:
-    st.session_state.improved_generator = ImprovedSFTNumberGenerator()
+@st.fragment
+def render_register(generator, footer):
+    """Single registration form; submitting reruns only this fragment"""
+    with st.form("register_form", clear_on_submit=True):
+        col1, col2 = st.columns(2)
+
+        with col1:
+            app_name = st.text_input("Application Name *", placeholder="e.g., WebApp_Authentication")
+            # Show preview of SFT format
+            if app_name:
+                preview_prefix = generator.extract_app_prefix(app_name)
+                st.info(f"SFT Format Preview: SFT_{preview_prefix}XXXX")
+
+        with col2:
+            description = st.text_area("Description", placeholder="Brief description of the application")
+
+        submitted = st.form_submit_button("🚀 Generate SFT Number", type="primary")
+
+        if submitted:
+            if app_name.strip():
+                try:
+                    sft_number = generator.register_application(
+                        app_name.strip(), 
+                        description.strip()
+                    )
+
+                    if sft_number:
+                        st.success(f"✅ Successfully registered '{app_name}' with SFT Number: **{sft_number}**")
+
+                        # Show the assigned number prominently
+                        st.markdown(f"""
+                        <div class="sft-number">
+                            🎯 Your SFT Number: {sft_number}
+                        </div>
+                        """, unsafe_allow_html=True)
+                        render_footer(footer, generator)
+                    else:
+                        st.error("❌ Failed to generate SFT number. Please try again.")
+
+                except Exception as e:
+                    st.error(f"❌ Error: {str(e)}")
+            else:
+                st.warning("⚠️ Please enter an application name.")
+
+@st.fragment
+def render_bulk(generator, footer):
+    """Bulk registration input and results; editing the list reruns only this fragment"""
+    st.info("💡 Enter multiple applications (one per line) in the format: AppName | Description")
+
+    bulk_input = st.text_area(
+        "Applications List",
+        placeholder="WebApp_Login | User login system\nMobileApp_Payment | Mobile payment app\nAPI_UserService | User management API",
+        height=200
+    )
+
+    if st.button("🚀 Bulk Register Applications", type="primary"):
+        if bulk_input.strip():
+            applications = [
+                {"name": match.group(1), "description": match.group(2) or ""}
+                for match in BULK_LINE_PATTERN.finditer(bulk_input)
+            ]
+
+            if applications:
+                import pandas as pd
+
+                with st.spinner(f"Registering {len(applications)} applications..."):
+                    results = generator.bulk_register_applications(applications)
+
+                # Collect the results table columns in one pass
+                app_names, sft_numbers, statuses = [], [], []
+                success_count = 0
+                for r in results:
+                    app_names.append(r['application'])
+                    sft_numbers.append(r['sft_number'] if r['sft_number'] else "Failed")
+                    statuses.append("✅ Success" if r['success'] else "❌ Failed")
+                    success_count += r['success']
+
+                # Display results
+                st.success(f"✅ Successfully registered {success_count}/{len(applications)} applications")
+                render_footer(footer, generator)
+
+                # Results table with SFT numbers
+                results_df = pd.DataFrame({
+                    "Application": app_names,
+                    "SFT Number": sft_numbers,
+                    "Status": statuses
+                })
+
+                st.dataframe(results_df, use_container_width=True)
+            else:
+                st.warning("⚠️ No valid applications found in the input.")
+        else:
+            st.warning("⚠️ Please enter at least one application.")
+
+@st.fragment
+def render_reserve(generator, footer):
+    """Reservation form; submitting reruns only this fragment"""
+    with st.form("reserve_form", clear_on_submit=True):
+        col1, col2 = st.columns(2)
+
+        with col1:
+            specific_number = st.number_input(
+                "Number to Reserve (3000-9999)",
+                min_value=3000,
+                max_value=9999,
+                value=5000,
+                step=1
+            )
+
+            app_name = st.text_input("Application Name *", placeholder="e.g., SpecialApp_VIP")
+            # Show preview
+            if app_name:
+                preview_prefix = generator.extract_app_prefix(app_name)
+                preview_sft = f"SFT_{preview_prefix}{specific_number}"
+                st.info(f"SFT Number Preview: {preview_sft}")
+
+        with col2:
+            # Check availability
+            available = generator.is_number_available(specific_number)
+            status_color = "🟢" if available else "🔴"
+            status_text = "Available" if available else "Already Used"
+            st.markdown(f"**Status:** {status_color} {status_text}")
+
+            description = st.text_area("Description", placeholder="Reason for specific number reservation")
+
+        submitted = st.form_submit_button("🔒 Reserve Number", type="primary")
+
+        if submitted:
+            if app_name.strip():
+                try:
+                    reserved_sft = generator.reserve_specific_number(
+                        specific_number,
+                        app_name.strip(),
+                        description.strip()
+                    )
+
+                    st.success(f"✅ Successfully reserved SFT Number **{reserved_sft}** for '{app_name}'")
+
+                    st.markdown(f"""
+                    <div class="sft-number">
+                        🎯 Reserved SFT Number: {reserved_sft}
+                    </div>
+                    """, unsafe_allow_html=True)
+                    render_footer(footer, generator)
+
+                except ValueError as e:
+                    st.error(f"❌ Reservation failed: {str(e)}")
+                except Exception as e:
+                    st.error(f"❌ Error: {str(e)}")
+            else:
+                st.warning("⚠️ Please enter an application name.")
+
+def render_footer(footer, generator):
+    """Draw the footer into its placeholder so fragments can refresh the stored count"""
+    with footer.container():
+        st.markdown("---")
+        st.markdown(
+            f"""
+            <div style='text-align: center; color: #666; padding: 1rem;'>
+                🔢 Enhanced SFT Number Generator | Format: SFT_XXYZ3000-9999 | 
+                Persistent Storage: {len(generator.applications)} applications stored
+            </div>
+            """,
+            unsafe_allow_html=True
+        )
 
 def main():
     # Header
@@ -265,8 +883,19 @@ def main():
     )
 
     # Get generator instance
-    generator = st.session_state.improved_generator
+    generator = get_generator()
+
+    # Pages render into body; the footer gets its own placeholder below it
+    body = st.container()
+    footer = st.empty()
+
+    with body:
+        render_page(page, generator, footer)
+
+    render_footer(footer, generator)
 
+def render_page(page, generator, footer):
+    """Draw the selected page"""
     # Dashboard
     if page == "🏠 Dashboard":
         st.header("📊 System Overview")
@@ -294,11 +923,12 @@ def main():
         st.progress(progress)
 
         # Recent applications
-        if st.session_state.applications:
+        if generator.applications:
             st.subheader("📋 Recent Applications")
-            df = pd.DataFrame(st.session_state.applications)
-            # Show last 10 registrations
-            recent_df = df.tail(10).sort_values('Registration_Date', ascending=False)
+            df = generator.get_applications_df()
+            # Show last 10 registrations, newest first (rows are stored in
+            # registration order, so no sort is needed)
+            recent_df = df.iloc[-10:][::-1]
             st.dataframe(recent_df, use_container_width=True)
 
             # Show SFT format examples
@@ -313,186 +943,25 @@ def main():
     elif page == "➕ Register Application":
         st.header("➕ Register New Application")
 
-        with st.form("register_form"):
-            col1, col2 = st.columns(2)
-
-            with col1:
-                app_name = st.text_input("Application Name *", placeholder="e.g., WebApp_Authentication")
-                # Show preview of SFT format
-                if app_name:
-                    preview_prefix = generator.extract_app_prefix(app_name)
-                    st.info(f"SFT Format Preview: SFT_{preview_prefix}XXXX")
-
-            with col2:
-                description = st.text_area("Description", placeholder="Brief description of the application")
-
-            submitted = st.form_submit_button("🚀 Generate SFT Number", type="primary")
-
-            if submitted:
-                if app_name.strip():
-                    try:
-                        sft_number = generator.register_application(
-                            app_name.strip(), 
-                            description.strip()
-                        )
-
-                        if sft_number:
-                            st.success(f"✅ Successfully registered '{app_name}' with SFT Number: **{sft_number}**")
-
-                            # Show the assigned number prominently
-                            st.markdown(f"""
-                            <div class="sft-number">
-                                🎯 Your SFT Number: {sft_number}
-                            </div>
-                            """, unsafe_allow_html=True)
-                        else:
-                            st.error("❌ Failed to generate SFT number. Please try again.")
-
-                    except Exception as e:
-                        st.error(f"❌ Error: {str(e)}")
-                else:
-                    st.warning("⚠️ Please enter an application name.")
+        render_register(generator, footer)
 
     # Bulk Registration
     elif page == "📊 Bulk Registration":
         st.header("📊 Bulk Application Registration")
 
-        st.info("💡 Enter multiple applications (one per line) in the format: AppName | Description")
-
-        bulk_input = st.text_area(
-            "Applications List",
-            placeholder="WebApp_Login | User login system\nMobileApp_Payment | Mobile payment app\nAPI_UserService | User management API",
-            height=200
-        )
-
-        if st.button("🚀 Bulk Register Applications", type="primary"):
-            if bulk_input.strip():
-                lines = bulk_input.strip().split('\n')
-                applications = []
-
-                for line in lines:
-                    if '|' in line:
-                        parts = line.split('|', 1)
-                        app_name = parts[0].strip()
-                        description = parts[1].strip() if len(parts) > 1 else ""
-                    else:
-                        app_name = line.strip()
-                        description = ""
-
-                    if app_name:
-                        applications.append({"name": app_name, "description": description})
-
-                if applications:
-                    with st.spinner(f"Registering {len(applications)} applications..."):
-                        results = generator.bulk_register_applications(applications)
-
-                    # Display results
-                    success_count = sum(1 for r in results if r['success'])
-                    st.success(f"✅ Successfully registered {success_count}/{len(applications)} applications")
-
-                    # Results table with SFT numbers
-                    results_df = pd.DataFrame([
-                        {
-                            "Application": r['application'],
-                            "SFT Number": r['sft_number'] if r['sft_number'] else "Failed",
-                            "Status": "✅ Success" if r['success'] else "❌ Failed"
-                        }
-                        for r in results
-                    ])
-
-                    st.dataframe(results_df, use_container_width=True)
-                else:
-                    st.warning("⚠️ No valid applications found in the input.")
-            else:
-                st.warning("⚠️ Please enter at least one application.")
+        render_bulk(generator, footer)
 
     # Reserve Specific Number
     elif page == "🎯 Reserve Number":
         st.header("🎯 Reserve Specific SFT Number")
 
-        with st.form("reserve_form"):
-            col1, col2 = st.columns(2)
-
-            with col1:
-                specific_number = st.number_input(
-                    "Number to Reserve (3000-9999)",
-                    min_value=3000,
-                    max_value=9999,
-                    value=5000,
-                    step=1
-                )
-
-                app_name = st.text_input("Application Name *", placeholder="e.g., SpecialApp_VIP")
-                # Show preview
-                if app_name:
-                    preview_prefix = generator.extract_app_prefix(app_name)
-                    preview_sft = f"SFT_{preview_prefix}{specific_number}"
-                    st.info(f"SFT Number Preview: {preview_sft}")
-
-            with col2:
-                # Check availability
-                available = generator.is_number_available(specific_number)
-                status_color = "🟢" if available else "🔴"
-                status_text = "Available" if available else "Already Used"
-                st.markdown(f"**Status:** {status_color} {status_text}")
-
-                description = st.text_area("Description", placeholder="Reason for specific number reservation")
-
-            submitted = st.form_submit_button("🔒 Reserve Number", type="primary")
-
-            if submitted:
-                if app_name.strip():
-                    try:
-                        reserved_sft = generator.reserve_specific_number(
-                            specific_number,
-                            app_name.strip(),
-                            description.strip()
-                        )
-
-                        st.success(f"✅ Successfully reserved SFT Number **{reserved_sft}** for '{app_name}'")
-
-                        st.markdown(f"""
-                        <div class="sft-number">
-                            🎯 Reserved SFT Number: {reserved_sft}
-                        </div>
-                        """, unsafe_allow_html=True)
-
-                    except ValueError as e:
-                        st.error(f"❌ Reservation failed: {str(e)}")
-                    except Exception as e:
-                        st.error(f"❌ Error: {str(e)}")
-                else:
-                    st.warning("⚠️ Please enter an application name.")
+        render_reserve(generator, footer)
 
     # Search Applications
     elif page == "🔍 Search Applications":
         st.header("🔍 Search Applications")
 
-        search_term = st.text_input("Search by Application Name, SFT Number, or Description", 
-                                  placeholder="e.g., WebApp or SFT_WEBA or authentication")
-
-        if search_term:
-            results = generator.search_applications(search_term)
-
-            if results:
-                st.success(f"Found {len(results)} matching applications:")
-                df = pd.DataFrame(results)
-                st.dataframe(df, use_container_width=True)
-
-                # Show breakdown by prefix
-                if len(results) > 1:
-                    prefixes = [app.get('App_Prefix', 'N/A') for app in results]
-                    prefix_counts = pd.Series(prefixes).value_counts()
-
-                    st.subheader("📊 Applications by Prefix")
-                    col1, col2 = st.columns(2)
-                    with col1:
-                        st.bar_chart(prefix_counts)
-                    with col2:
-                        for prefix, count in prefix_counts.items():
-                            st.metric(f"Prefix: {prefix}", count)
-            else:
-                st.info("No applications found matching your search term.")
+        render_search(generator)
 
     # Statistics
     elif page == "📈 Statistics":
@@ -513,18 +982,17 @@ def main():
 
         with col2:
             st.subheader("🎯 Number Range Analysis")
-            if st.session_state.used_numbers:
-                used_numbers = list(st.session_state.used_numbers)
-                st.write(f"**Lowest Used:** {min(used_numbers)}")
-                st.write(f"**Highest Used:** {max(used_numbers)}")
-                st.write(f"**Average:** {sum(used_numbers)/len(used_numbers):.0f}")
+            if stats['used_count']:
+                st.write(f"**Lowest Used:** {stats['lowest_used']}")
+                st.write(f"**Highest Used:** {stats['highest_used']}")
+                st.write(f"**Average:** {stats['average_used']:.0f}")
             else:
                 st.write("No numbers used yet.")
 
         # Application prefix analysis
-        if st.session_state.applications:
+        if generator.applications:
             st.subheader("🏷️ Application Prefix Analysis")
-            df = pd.DataFrame(st.session_state.applications)
+            data_version, df = generator.get_versioned_applications_df()
 
             # Prefix distribution
             prefix_counts = df['App_Prefix'].value_counts()
@@ -540,9 +1008,8 @@ def main():
 
             # Registration timeline
             st.subheader("📅 Registration Timeline")
-            df['Date'] = pd.to_datetime(df['Registration_Date']).dt.date
-            daily_counts = df.groupby('Date').size().reset_index(name='Applications')
-            st.line_chart(daily_counts.set_index('Date'))
+            daily_counts = registration_timeline(df, data_version)
+            st.line_chart(daily_counts)
 
     # Export Data
     elif page == "💾 Export Data":
@@ -551,68 +1018,51 @@ def main():
         # Get stats for export
         stats = generator.get_statistics()
 
-        if st.session_state.applications:
-            df = pd.DataFrame(st.session_state.applications)
+        if generator.applications:
+            data_version, df = generator.get_versioned_applications_df()
 
             st.subheader("📋 Current Data Preview")
-            st.dataframe(df, use_container_width=True)
+            # Only the first rows are sent to the browser; the downloads have everything
+            st.dataframe(df.head(EXPORT_PREVIEW_ROWS), use_container_width=True)
+            if len(df) > EXPORT_PREVIEW_ROWS:
+                st.caption(f"Showing first {EXPORT_PREVIEW_ROWS} of {len(df):,} rows")
 
             # Export options
             st.subheader("📥 Download Options")
 
-            col1, col2 = st.columns(2)
+            col1, col2, col3 = st.columns(3)
 
             with col1:
-                # Excel export
-                excel_data = io.BytesIO()
-                with pd.ExcelWriter(excel_data, engine='openpyxl') as writer:
-                    df.to_excel(writer, index=False, sheet_name='Applications')
-
-                    # Add summary sheet with stats
-                    summary_data = {
-                        'Metric': ['Total Available', 'Used Numbers', 'Remaining Numbers', 'Usage Percentage'],
-                        'Value': [stats['total_available'], stats['used_count'], 
-                                 stats['remaining'], f"{stats['usage_percentage']:.2f}%"]
-                    }
-                    summary_df = pd.DataFrame(summary_data)
-                    summary_df.to_excel(writer, index=False, sheet_name='Summary')
-
-                    # Prefix analysis sheet
-                    if len(df) > 0:
-                        prefix_analysis = df['App_Prefix'].value_counts().reset_index()
-                        prefix_analysis.columns = ['Prefix', 'Count']
-                        prefix_analysis.to_excel(writer, index=False, sheet_name='Prefix_Analysis')
-
+                # The workbook is only built when the button is clicked
                 st.download_button(
                     label="📊 Download Complete Excel Report",
-                    data=excel_data.getvalue(),
+                    data=lambda: build_excel_report(df, stats, data_version),
                     file_name=f"sft_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
-                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                    on_click="ignore"
                 )
 
             with col2:
                 # CSV export
-                csv = df.to_csv(index=False)
                 st.download_button(
                     label="📋 Download CSV Data",
-                    data=csv,
+                    data=lambda: build_csv(df, data_version),
                     file_name=f"sft_data_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-                    mime="text/csv"
+                    mime="text/csv",
+                    on_click="ignore"
+                )
+
+            with col3:
+                # Parquet export: much smaller and faster to build than Excel for large tables
+                st.download_button(
+                    label="🗜️ Download Parquet Data",
+                    data=lambda: build_parquet(df, data_version),
+                    file_name=f"sft_data_{datetime.now().strftime('%Y%m%d_%H%M%S')}.parquet",
+                    mime="application/vnd.apache.parquet",
+                    on_click="ignore"
                 )
         else:
             st.info("📭 No data available to export. Register some applications first!")
 
-    # Footer
-    st.markdown("---")
-    st.markdown(
-        f"""
-        <div style='text-align: center; color: #666; padding: 1rem;'>
-            🔢 Enhanced SFT Number Generator | Format: SFT_XXYZ3000-9999 | 
-            Persistent Storage: {len(st.session_state.applications)} applications stored
-        </div>
-        """,
-        unsafe_allow_html=True
-    )
-
 if __name__ == "__main__":
     main()